@@ -278,7 +278,7 @@ from ansible_collections.community.general.plugins.module_utils.proxmox import (
     ProxmoxAnsible, proxmox_auth_argument_spec)
 from ansible_collections.community.general.plugins.module_utils.proxmox_interfaces import (
     get_nics, delete_nic, create_nic, reload_interfaces, rollback_interfaces,
-    update_nic, proxmox_map_interface_args, proxmox_interface_argument_spec, check_doublicates,
+    update_nic, proxmox_map_interface_args, proxmox_interface_argument_spec, check_duplicates,
     get_config_diff)
 from ansible.module_utils.basic import AnsibleModule
 
@@ -333,9 +333,12 @@ def main():
                 node, str(e))
             module.fail_json(**result)
 
-    check_doublicates(module)
+    check_duplicates(module)
     present_nics = {nic['iface'] for nic in nics}
-    diff = get_config_diff(nics, config)
+    try:
+        diff = get_config_diff(nics, config)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
     config = {nic['name']: nic for nic in config}
 
     if diff is None:
@@ -134,14 +134,10 @@ class ProxmoxTaskInfoAnsible(ProxmoxAnsible):
 
 class ProxmoxTask:
     def __init__(self, task):
-        self.info = dict()
-        for k, v in task.items():
-            if k == 'status' and isinstance(v, str):
-                self.info[k] = v
-                if v != 'OK':
-                    self.info['failed'] = True
-            else:
-                self.info[k] = v
+        self.info = dict(task)
+        status = self.info.get('status')
+        if isinstance(status, str) and status != 'OK':
+            self.info['failed'] = True
 
 
 def proxmox_task_info_argument_spec():
@@ -8,10 +8,14 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import json
+import pytest
 
+from ansible_collections.community.general.plugins.module_utils import proxmox
 from ansible_collections.community.general.plugins.module_utils import proxmox_interfaces as proxmox_utils
 from ansible_collections.community.general.plugins.modules.cloud.misc import proxmox_interfaces
-from ansible_collections.community.general.tests.unit.compat.mock import MagicMock
+from ansible_collections.community.general.tests.unit.compat.mock import MagicMock, patch
+from ansible_collections.community.general.tests.unit.plugins.modules.utils import set_module_args
 from pprint import pp
 
 NODE = 'node01'
@@ -116,25 +120,65 @@ def test_map_interface_args(capfd, mocker):
     assert expected == ret
 
 
-def test_check_no_doublicates(mocker):
+def test_map_interface_args_booleans():
+    params = dict((k, None) for k in CONFIG_EQUAL[0])
+    params.update({'name': 'vmbr0',
+                   'autostart': False,
+                   'bridge_vlan_ports': True})
+    ret = proxmox_utils.proxmox_map_interface_args(params)
+    assert ret['autostart'] == '0'
+    assert ret['bridge_vlan_ports'] == '1'
+
+
+@pytest.mark.parametrize('param, value', [
+    ('mtu', 1000),
+    ('ovs_tag', 0),
+    ('vlan_id', 4095),
+])
+def test_map_interface_args_out_of_range(param, value):
+    with pytest.raises(ValueError):
+        proxmox_utils.proxmox_map_interface_args({'name': 'vmbr0', param: value})
+
+
+@patch('ansible_collections.community.general.plugins.module_utils.proxmox.ProxmoxAnsible._connect')
+def test_out_of_range_arg_fails_cleanly(connect_mock, capfd, mocker):
+    set_module_args({'api_host': 'proxmoxhost',
+                     'api_user': 'root@pam',
+                     'api_password': 'supersecret',
+                     'node': NODE,
+                     'config': [{'name': 'vmbr0', 'vlan_id': 5000}]})
+    api = mocker.MagicMock()
+    api.nodes.return_value.network.get.return_value = []
+    connect_mock.return_value = api
+    proxmox.HAS_PROXMOXER = True
+
+    with pytest.raises(SystemExit):
+        proxmox_interfaces.main()
+    out, err = capfd.readouterr()
+    assert not err
+    assert json.loads(out)['failed']
+    assert json.loads(out)['msg'] == 'vlan_id has to be between 1 and 4094 but was 5000'
+
+
+def test_check_no_duplicates(mocker):
     module = mocker.MagicMock()
     params = {'config': [{'name': 'vmbr0', 'type': 'bridge'},
                          {'name': 'vmrb1', 'type': 'bridge'}]}
 
     module.params = params
     module.fail_json.assert_not_called()
-    proxmox_utils.check_doublicates(module)
+    proxmox_utils.check_duplicates(module)
     module.fail_json.assert_not_called()
 
 
-def test_check_doublicates(mocker):
+def test_check_duplicates(mocker):
     module = mocker.MagicMock()
     iface = 'vmbr0'
     params = {'config': [{'name': iface, 'type': 'bridge'},
                          {'name': iface, 'type': 'bridge'}]}
 
     module.params = params
-    proxmox_utils.check_doublicates(module)
+    proxmox_utils.check_duplicates(module)
     module.fail_json.assert_called_once_with(
         msg="Interface {0} can only be present once in list".format(iface))
 
@@ -182,3 +226,16 @@ def test_get_config_diff_new_interface(capfd):
     assert isinstance(config_after, dict)
     for key in keys:
         assert key in config_after
+
+
+def test_to_ansible_interface_args_does_not_modify_input():
+    nic = dict(CONFIG_BEFORE[0])
+    ret = proxmox_utils.proxmox_to_ansible_interface_args(nic)
+    assert ret is not nic
+    assert ret['autostart'] is True
+    assert nic['autostart'] is not True
+
+
+def test_map_interface_args_missing_keys():
+    ret = proxmox_utils.proxmox_map_interface_args({'name': 'vmbr0', 'mtu': 1500})
+    assert ret == {'iface': 'vmbr0', 'mtu': 1500}